@@ -1,3 +1,6 @@
+import hashlib
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -5,32 +8,118 @@ from datetime import datetime, timedelta
 from io import BytesIO
 from streamlit.runtime.scriptrunner import RerunException, RerunData
 
-def holt_forecast(data, alpha=0.2, beta=0.1, periods=1):
-    if len(data) < 2:
-        return np.nan
-    level = data[0]
-    trend = data[1] - data[0]
-    forecasts = []
-    for i in range(1, len(data)):
-        level_prev = level
-        level = alpha * data[i] + (1 - alpha) * (level + trend)
-        trend = beta * (level - level_prev) + (1 - beta) * trend
-    for _ in range(periods):
-        forecast = level + trend
-        forecasts.append(forecast)
-        level_prev = level
-        level = alpha * forecast + (1 - alpha) * (level + trend)
-        trend = beta * (level - level_prev) + (1 - beta) * trend
-    return forecasts
+from forecast_core import holt_forecast
 
-@st.cache_data
-def load_articles():
-    df = pd.read_excel("articles.xlsx", engine='openpyxl')
-    df.columns = df.columns.str.replace('\n', ' ', regex=True)
-    df.columns = df.columns.str.strip().str.lower()
+try:
+    from python_calamine import CalamineWorkbook
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    CalamineWorkbook = None
+    EXCEL_ENGINE = 'openpyxl'
+
+ARTICLES_FILE = "articles.xlsx"
+CACHE_DIR = ".cache"
+ARTICLE_COLUMNS = ['code ean uvc', 'nom article(25car)', 'libellé fournisseur']
+# Bump when parse_articles changes so stale parquet copies are not served.
+ARTICLES_CACHE_VERSION = 1
+ARTICLES_CACHE_TAG = hashlib.sha256(
+    repr((ARTICLES_CACHE_VERSION, ARTICLE_COLUMNS)).encode('utf-8')
+).hexdigest()[:12]
+
+def normalize_column(name):
+    return str(name).replace('\n', ' ').strip().lower()
+
+def parse_articles():
+    # read_excel still reads every cell; usecols only keeps the three columns
+    # the app displays as DataFrame columns.
+    df = pd.read_excel(
+        ARTICLES_FILE,
+        engine=EXCEL_ENGINE,
+        usecols=lambda name: normalize_column(name) in ARTICLE_COLUMNS
+    )
+    df.columns = [normalize_column(name) for name in df.columns]
     df['code ean uvc'] = df['code ean uvc'].astype(str)
     return df
 
+def index_articles(df):
+    # A stable sort keeps file order among duplicate EANs, so the first
+    # occurrence still wins in build_article_index.
+    return df.set_index('code ean uvc', drop=False).sort_index(kind='stable')
+
+def build_article_index(df):
+    df = df[~df.index.duplicated()]
+    eans = df.index.tolist()
+    articles = df[ARTICLE_COLUMNS[1:]].to_dict('index')
+    return eans, frozenset(eans), articles
+
+@st.cache_data
+def load_articles():
+    with open(ARTICLES_FILE, 'rb') as f:
+        file_hash = hashlib.sha256(f.read()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"articles_{ARTICLES_CACHE_TAG}_{file_hash}.parquet")
+    if os.path.exists(cache_path):
+        df = pd.read_parquet(cache_path)
+    else:
+        df = parse_articles()
+        # The parquet copy is only an accelerator: columns pyarrow cannot
+        # serialise (e.g. mixed types) just mean the next worker re-parses.
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return index_articles(df)
+
+# cache_resource hands back the same objects on every rerun instead of
+# unpickling copies; callers only read from them.
+@st.cache_resource
+def load_article_index():
+    return build_article_index(load_articles())
+
+@st.cache_data
+def cached_forecast(data_tuple, alpha=0.2, beta=0.1, periods=1):
+    return holt_forecast(np.asarray(data_tuple, dtype=np.float64), alpha, beta, periods)
+
+def build_forecast_df(forecasts, periods):
+    forecast_dates = pd.date_range(
+        start=datetime.now() + timedelta(days=30),
+        periods=periods,
+        freq='30D',
+        normalize=True
+    )
+    # date_range is already in order, so no sort is needed.
+    return pd.DataFrame({
+        "Mois": forecast_dates.strftime("%B %Y"),
+        "Prévision": [round(val, 2) for val in forecasts],
+        "Tendance": np.where(np.diff(forecasts, prepend=forecasts[0]) > 0, "↑", "↓"),
+        "date_sort": forecast_dates
+    })
+
+@st.cache_data
+def to_csv_bytes(df):
+    return df.to_csv(index=False, sep=";").encode('utf-8')
+
+@st.cache_data
+def to_xlsx_bytes(df):
+    output_excel = BytesIO()
+    with pd.ExcelWriter(output_excel, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False, sheet_name="Prévisions")
+    return output_excel.getvalue()
+
+def read_history_sheet(uploaded_file):
+    if CalamineWorkbook is not None:
+        rows = CalamineWorkbook.from_filelike(uploaded_file).get_sheet_by_index(0).to_python()
+        if not rows:
+            return [], []
+        return list(rows[0]), rows[1:]
+    df_history = pd.read_excel(uploaded_file, engine=EXCEL_ENGINE)
+    return df_history.columns.tolist(), df_history.values.tolist()
+
 def reset_session():
     for key in st.session_state.keys():
         del st.session_state[key]
@@ -48,7 +137,7 @@ def main():
         raise RerunException(RerunData())
 
     try:
-        df_articles = load_articles()
+        eans, ean_set, articles = load_article_index()
     except Exception as e:
         st.error(f"Erreur de chargement du fichier articles.xlsx : {e}")
         st.stop()
@@ -57,7 +146,7 @@ def main():
     with col1:
         selected_ean = st.selectbox(
             "Code article :",
-            options=[""] + df_articles['code ean uvc'].unique().tolist(),
+            options=[""] + eans,
             index=0
         )
 
@@ -65,11 +154,11 @@ def main():
         st.warning("Veuillez sélectionner un code article.")
         st.stop()
 
-    if selected_ean not in df_articles['code ean uvc'].values:
+    if selected_ean not in ean_set:
         st.error("Le code article sélectionné n'existe pas dans le fichier.")
         st.stop()
 
-    article_info = df_articles[df_articles['code ean uvc'] == selected_ean].iloc[0]
+    article_info = articles[selected_ean]
 
     with col1:
         st.text_input("Nom article :", value=article_info['nom article(25car)'], disabled=True)
@@ -90,11 +179,18 @@ def main():
 
     if uploaded_file is not None:
         try:
-            df_history = pd.read_excel(uploaded_file, engine='openpyxl')
-            if {'mois', 'value'}.issubset(df_history.columns):
-                if len(df_history) >= 12:
-                    historical_data = df_history['value'].head(12).tolist()
-                    st.success("Données historiques importées avec succès!")
+            columns, rows = read_history_sheet(uploaded_file)
+            if {'mois', 'value'}.issubset(columns):
+                if len(rows) >= 12:
+                    value_idx = columns.index('value')
+                    values = pd.to_numeric(
+                        [row[value_idx] for row in rows[:12]], errors='coerce'
+                    )
+                    if np.isnan(values).any():
+                        st.error("La colonne 'value' doit contenir 12 valeurs numériques")
+                    else:
+                        historical_data = values.tolist()
+                        st.success("Données historiques importées avec succès!")
                 else:
                     st.warning("Le fichier doit contenir au moins 12 mois de données")
             else:
@@ -104,18 +200,17 @@ def main():
 
     if not historical_data:
         st.info("Ou saisir manuellement les données:")
-        cols = st.columns(12)
-        historical_data = []
-        for i, col in enumerate(cols):
-            with col:
-                val_str = col.text_input(f"{i+1}", value="0", key=f"hist_str_{i}")
-                try:
-                    val = float(val_str.replace(',', '.'))
-                    if val < 0:
-                        val = 0.0
-                except ValueError:
-                    val = 0.0
-                historical_data.append(val)
+        edited = st.data_editor(
+            pd.DataFrame({"Mois": months, "Valeur": [0.0] * 12}),
+            column_config={
+                "Valeur": st.column_config.NumberColumn(min_value=0.0, step=1.0)
+            },
+            disabled=["Mois"],
+            hide_index=True,
+            key="hist_editor"
+        )
+        # Cleared cells come back empty; treat them as 0 like invalid input was.
+        historical_data = edited["Valeur"].fillna(0.0).to_numpy(dtype=np.float64)
 
     st.markdown("### Nombre de période à prévoir")
     periods = st.number_input(
@@ -126,64 +221,50 @@ def main():
         step=1
     )
 
+    # Results are kept in session_state so reruns triggered by other widgets
+    # (e.g. the download buttons) redisplay them without recomputing.
+    hist_arr = np.asarray(historical_data, dtype=np.float64)
+    forecast_key = (selected_ean, hist_arr.tobytes(), periods)
+
     if st.button("Générer les prévisions"):
-        if all(v == 0 for v in historical_data):
+        if not hist_arr.any():
             st.error("Veuillez entrer des données historiques non nulles")
-        else:
+        elif st.session_state.get('fc_key') != forecast_key:
             with st.spinner(f"Calcul des prévisions pour {periods} mois..."):
-                forecasts = holt_forecast(historical_data, periods=periods)
-                st.markdown("### Résultats des prévisions")
-
-                forecast_months = []
-                current_date = datetime.now()
-                for i in range(periods):
-                    forecast_date = current_date + timedelta(days=30*(i+1))
-                    forecast_months.append(forecast_date.strftime("%B %Y"))
-
-                st.markdown("#### Valeurs historiques")
-                st.dataframe(pd.DataFrame({
-                    "Mois": months,
-                    "Valeurs": historical_data
-                }), height=400)
-
-                st.markdown(f"#### Prévisions ({periods} mois)")
-                forecast_df = pd.DataFrame({
-                    "Mois": forecast_months,
-                    "Prévision": [round(val, 2) for val in forecasts],
-                    "Tendance": ["↑" if i > 0 and forecasts[i] > forecasts[i-1] else "↓" for i in range(len(forecasts))]
-                })
-
-
-                forecast_df['date_sort'] = pd.to_datetime(forecast_df['Mois'], format="%B %Y")
-                forecast_df = forecast_df.sort_values('date_sort')
-
-                st.dataframe(forecast_df.drop(columns='date_sort'), height=600)
-
-                chart_df = forecast_df.set_index('date_sort')["Prévision"]
-                chart_df.index.name = "Date"
-                st.line_chart(chart_df, height=400)
-
-
-                output_excel = BytesIO()
-                with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
-                    forecast_df.to_excel(writer, index=False, sheet_name="Prévisions")
-                    writer.close()
-                    output_excel.seek(0)
-
-                st.download_button(
-                    label="📤 Exporter au format Excel (.xlsx)",
-                    data=output_excel,
-                    file_name=f"previsions_{selected_ean}_{periods}mois.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-
-                csv = forecast_df.to_csv(index=False, sep=";").encode('utf-8')
-                st.download_button(
-                    "📥 Exporter au format CSV",
-                    csv,
-                    f"previsions_{selected_ean}_{periods}mois.csv",
-                    "text/csv"
-                )
+                forecasts = cached_forecast(tuple(hist_arr.tolist()), periods=periods)
+                st.session_state['fc_df'] = build_forecast_df(forecasts, periods)
+                st.session_state['fc_key'] = forecast_key
+
+    if st.session_state.get('fc_key') == forecast_key:
+        forecast_df = st.session_state['fc_df']
+        st.markdown("### Résultats des prévisions")
+
+        st.markdown("#### Valeurs historiques")
+        st.dataframe(pd.DataFrame({
+            "Mois": months,
+            "Valeurs": historical_data
+        }), height=400)
+
+        st.markdown(f"#### Prévisions ({periods} mois)")
+        st.dataframe(forecast_df.drop(columns='date_sort'), height=600)
+
+        chart_df = forecast_df.set_index('date_sort')["Prévision"]
+        chart_df.index.name = "Date"
+        st.line_chart(chart_df, height=400)
+
+        st.download_button(
+            label="📤 Exporter au format Excel (.xlsx)",
+            data=to_xlsx_bytes(forecast_df),
+            file_name=f"previsions_{selected_ean}_{periods}mois.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+        st.download_button(
+            "📥 Exporter au format CSV",
+            to_csv_bytes(forecast_df),
+            f"previsions_{selected_ean}_{periods}mois.csv",
+            "text/csv"
+        )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,37 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _holt_core(data: np.ndarray, alpha: float, beta: float, periods: int) -> np.ndarray:
+    one_minus_alpha = 1.0 - alpha
+    one_minus_beta = 1.0 - beta
+    level = data[0]
+    trend = data[1] - data[0]
+    for value in data[1:]:
+        level_prev = level
+        level = alpha * value + one_minus_alpha * (level + trend)
+        trend = beta * (level - level_prev) + one_minus_beta * trend
+    # Feeding each forecast back as the next observation gives
+    #   level' = alpha * (level + trend) + (1 - alpha) * (level + trend) = level + trend
+    #   trend' = beta * (level' - level) + (1 - beta) * trend = trend
+    # so the k-th forecast is level + k * trend.
+    return level + trend * np.arange(1, periods + 1)
+
+
+if njit is not None:
+    holt_core = njit(cache=True, fastmath=True)(_holt_core)
+    # Compile (or load from the on-disk cache) now rather than on first click.
+    holt_core(np.zeros(2), 0.2, 0.1, 1)
+else:
+    holt_core = _holt_core
+
+
+def holt_forecast(data, alpha=0.2, beta=0.1, periods=1):
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) < 2:
+        return np.nan
+    return holt_core(data, alpha, beta, int(periods)).tolist()
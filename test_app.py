@@ -0,0 +1,15 @@
+import pandas as pd
+
+from app import build_article_index, index_articles
+
+
+def test_duplicate_ean_keeps_first_occurrence():
+    df = pd.DataFrame({
+        'code ean uvc': ['200', '100', '300', '100', '100'],
+        'nom article(25car)': ['B', 'FIRST', 'C', 'SECOND', 'THIRD'],
+        'libellé fournisseur': ['f2', 'f1', 'f3', 'f4', 'f5'],
+    })
+    eans, ean_set, articles = build_article_index(index_articles(df))
+    assert eans == ['100', '200', '300']
+    assert ean_set == frozenset(eans)
+    assert articles['100'] == {'nom article(25car)': 'FIRST', 'libellé fournisseur': 'f1'}
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import forecast_core
+from forecast_core import _holt_core, holt_core, holt_forecast
+
+
+def loop_holt_forecast(data, alpha=0.2, beta=0.1, periods=1):
+    # The original iterative implementation the closed form replaced.
+    level = data[0]
+    trend = data[1] - data[0]
+    forecasts = []
+    for i in range(1, len(data)):
+        level_prev = level
+        level = alpha * data[i] + (1 - alpha) * (level + trend)
+        trend = beta * (level - level_prev) + (1 - beta) * trend
+    for _ in range(periods):
+        forecast = level + trend
+        forecasts.append(forecast)
+        level_prev = level
+        level = alpha * forecast + (1 - alpha) * (level + trend)
+        trend = beta * (level - level_prev) + (1 - beta) * trend
+    return forecasts
+
+
+CORES = [pytest.param(_holt_core, id="python")]
+if forecast_core.njit is not None:
+    CORES.append(pytest.param(holt_core, id="numba"))
+
+
+@pytest.mark.parametrize("core", CORES)
+@pytest.mark.parametrize("periods", [1, 6, 12, 120])
+def test_closed_form_matches_loop(core, periods):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        data = rng.uniform(0, 1000, size=12)
+        expected = loop_holt_forecast(data.tolist(), periods=periods)
+        result = core(data, 0.2, 0.1, periods)
+        assert result.shape == (periods,)
+        assert np.allclose(result, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_holt_forecast_returns_list():
+    data = [10.0, 12.0, 11.0, 15.0]
+    result = holt_forecast(data, periods=3)
+    assert isinstance(result, list)
+    assert np.allclose(result, loop_holt_forecast(data, periods=3))
+
+
+def test_holt_forecast_short_history():
+    assert np.isnan(holt_forecast([5.0], periods=3))